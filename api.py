@@ -1,6 +1,8 @@
-from pydantic import BaseModel
-from typing import Optional
-from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel, Field
+from typing import Optional, List
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from contextlib import nullcontext
 from threading import Lock
 import logging
 
@@ -9,6 +11,9 @@ from utility.feed_parser import FeedTracker
 from utility.json_parser import JSON_Parser
 from utility.db_handler import DB_Handler
 from utility.commit_maker import CommitMaker
+from utility.archiver import Archiver
+from utility.profiler import profile_run, profile_store
+from utility.file_writer import durable_batch
 
 
 import config as CONFIG
@@ -16,12 +21,25 @@ import config as CONFIG
 
 class PipelineRequest(BaseModel):
     user_id: Optional[str] = CONFIG.user_id
+    profile: bool = False
 
 class UpdateRequest(BaseModel):
     url:str
     notebook_link: str
     user_id: Optional[str] = CONFIG.user_id
 
+class NotebookLink(BaseModel):
+    url: str
+    notebook_link: str
+
+class BulkUpdateRequest(BaseModel):
+    links: List[NotebookLink]
+    user_id: Optional[str] = CONFIG.user_id
+
+class CompactRequest(BaseModel):
+    max_age_days: Optional[int] = Field(None, ge=1)
+    user_id: Optional[str] = CONFIG.user_id
+
 
 # Core API Class
 
@@ -38,6 +56,7 @@ class NewsService:
         self.json_parser = JSON_Parser()
         self.db_handler = DB_Handler()
         self.commit_maker = CommitMaker()
+        self.archiver = Archiver(self.db_handler)
 
         self.pipline_runnig = False
 
@@ -58,7 +77,11 @@ class NewsService:
                 "version": "1.0.1",
                 "endpoints": [
                     "/health",
-                    "/pipeline/run"
+                    "/pipeline/run",
+                    "/articles/notebook-links",
+                    "/archive/compact",
+                    "/archive/cold",
+                    "/pipeline/profiles"
                 ]
             }
 
@@ -72,6 +95,84 @@ class NewsService:
                 "running" : self.pipline_runnig
             }
 
+        @self.app.post("/articles/notebook-links")
+        def update_notebook_links(request: BulkUpdateRequest):
+
+            self.logger.info("Notebook LM update of %s links requested by %s", len(request.links), request.user_id)
+
+            try:
+                return self.db_handler.bulk_update_notebook_lm_links(
+                    [{"url": link.url, "notebook_link": link.notebook_link} for link in request.links],
+                    user_id=request.user_id
+                )
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+
+        @self.app.get("/pipeline/profiles")
+        def list_profiles():
+            return {"profiles": profile_store.list()}
+
+        @self.app.get("/pipeline/profiles/{profile_id}", response_class=PlainTextResponse)
+        def get_profile(profile_id: int, format: str = "pstats"):
+            if format not in ("pstats", "collapsed"):
+                raise HTTPException(status_code=400, detail="format must be pstats or collapsed")
+
+            profile = profile_store.get(profile_id)
+            if profile is None:
+                raise HTTPException(status_code=404, detail="Profile not found")
+
+            return profile[format]
+
+        @self.app.post("/archive/compact")
+        def compact_archive(request: CompactRequest):
+
+            self.logger.info("Archive compaction requested by %s", request.user_id)
+
+            # Compaction rewrites the backup JSON, so it can't overlap a pipeline run
+            locked = self.pipeline_lock.acquire(blocking=False)
+            if not locked:
+                self.logger.warning("Pipeline already running")
+                raise HTTPException(
+                    status_code=429,
+                    detail="Pipeline already running"
+                )
+
+            try:
+                result = self.archiver.compact(max_age_days=request.max_age_days, user_id=request.user_id)
+
+                # Commit right away, archived articles now only exist in the cold files
+                if result["archived"] and self.commit_maker.commit_if_needed():
+                    self.logger.info("Changes committed.")
+
+                return result
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            except Exception as e:
+                self.logger.exception("Archive compaction failed.")
+                raise HTTPException(status_code=500, detail=str(e))
+            finally:
+                self.pipeline_lock.release()
+
+        @self.app.get("/archive/cold")
+        def read_archive(
+            partition: Optional[str] = None,
+            offset: int = Query(0, ge=0),
+            limit: int = Query(100, ge=1, le=1000)
+        ):
+            try:
+                articles = list(self.archiver.read_cold(partition, offset=offset, limit=limit))
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+
+            return {
+                "partitions": self.archiver.list_partitions(),
+                "offset": offset,
+                "count": len(articles),
+                # Cold files are read lazily, so the total isn't known up front
+                "next_offset": offset + len(articles) if len(articles) == limit else None,
+                "articles": articles
+            }
+
         @self.app.post("/pipeline/run")
         def run_pipeline(request: PipelineRequest):
             
@@ -96,26 +197,33 @@ class NewsService:
                 }
 
             try:    
-                self.logger.info("Searching news feed.")
-                feed_count = self.feed_tracker.check_feed()
-                self.logger.info("Feed Check completed: %s new articles", feed_count)
+                profiler = profile_run("pipeline") if request.profile else nullcontext()
+                with profiler as profile:
+                    if profile:
+                        response["profile_id"] = profile["id"]
 
-                self.logger.info("Starting Json generation.")
-                json_count = self.json_parser.generate_new_json()
-                self.logger.info("%s new articles added", json_count)
+                    # One durability barrier for every file written in this run
+                    with durable_batch():
+                        self.logger.info("Searching news feed.")
+                        feed_count = self.feed_tracker.check_feed()
+                        self.logger.info("Feed Check completed: %s new articles", feed_count)
 
-                self.logger.info("Starting DB sync")
-                db_count = self.db_handler.sync_db(user_id=request.user_id)
-                self.logger.info("%s new articles synced", db_count)
+                        self.logger.info("Starting Json generation.")
+                        json_count = self.json_parser.generate_new_json()
+                        self.logger.info("%s new articles added", json_count)
 
+                    self.logger.info("Starting DB sync")
+                    db_count = self.db_handler.sync_db(user_id=request.user_id)
+                    self.logger.info("%s new articles synced", db_count)
 
-                response["feed_new_articles"] = feed_count
-                response["json_new_articles"] = json_count or 0
-                response["db_new_articles"] = db_count or 0
 
-                commits = self.commit_maker.commit_if_needed()
-                if commits:
-                    self.logger.info("Changes committed.")
+                    response["feed_new_articles"] = feed_count
+                    response["json_new_articles"] = json_count or 0
+                    response["db_new_articles"] = db_count or 0
+
+                    commits = self.commit_maker.commit_if_needed()
+                    if commits:
+                        self.logger.info("Changes committed.")
                     
 
                 self.logger.info(("Pipeline completed successfully"))
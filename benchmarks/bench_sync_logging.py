@@ -0,0 +1,90 @@
+"""
+Sync throughput with the audit log on: 100k new articles through DB_Handler.sync_db.
+
+MongoDB is replaced by an in-memory collection so only sync_db and the
+audit log are measured. Run from the repository root:
+
+    python benchmarks/bench_sync_logging.py [count]
+"""
+import os
+import sys
+import json
+import time
+import types
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+class MemoryCollection:
+    # Just what sync_db touches
+
+    def __init__(self):
+        self.documents = {}
+
+    def find(self, query, projection=None):
+        return list(self.documents.values())
+
+    def insert_one(self, document):
+        self.documents[document["_id"]] = document
+
+
+def _install_config(work_dir: str):
+    config = types.ModuleType("config")
+    config.URI = "mongodb://localhost:27017"
+    config.DB_NAME = "bench"
+    config.DB_COLLECTION = "articles"
+    config.user_id = "bench"
+    config.backup_json_path = os.path.join(work_dir, "backup.json")
+    config.database_log = os.path.join(work_dir, "db.log")
+    sys.modules["config"] = config
+    return config
+
+
+def main(count: int = 100_000):
+    with tempfile.TemporaryDirectory() as work_dir:
+        config = _install_config(work_dir)
+
+        with open(config.backup_json_path, "w", encoding="utf-8") as f:
+            json.dump({
+                f"genArt{i:06d}": {"Type": "General Article", "Name": f"Article {i}", "URL": f"https://example.com/{i}"}
+                for i in range(count)
+            }, f)
+
+        from utility.db_handler import DB_Handler
+        from utility.audit_log import get_audit_log
+        from utility.cold_url_index import ColdURLIndex
+
+        # Skip __init__, it would open a MongoClient
+        handler = DB_Handler.__new__(DB_Handler)
+        handler.collection = MemoryCollection()
+        handler.backup_json_path = config.backup_json_path
+        handler.audit_log = get_audit_log()
+        handler.last_modified = None
+        handler.url_index = {}
+        # Real (empty) cold index, is_duplicate_url pays its production cost
+        handler.cold_urls = ColdURLIndex(os.path.join(work_dir, "archive", "urls.idx"))
+
+        start = time.perf_counter()
+        inserted = handler.sync_db(user_id=config.user_id)
+        synced = time.perf_counter()
+        handler.audit_log.flush()
+        flushed = time.perf_counter()
+
+        with open(config.database_log, "r", encoding="utf-8") as f:
+            lines = sum(1 for _ in f) + sum(
+                sum(1 for _ in open(segment, encoding="utf-8"))
+                for segment in handler.audit_log.closed_segments()
+            )
+
+        handler.audit_log.close()
+
+    print(f"inserted:        {inserted}")
+    print(f"audit lines:     {lines}")
+    print(f"sync_db:         {synced - start:.2f}s ({inserted / (synced - start):,.0f} inserts/s)")
+    print(f"sync + flushed:  {flushed - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
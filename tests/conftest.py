@@ -0,0 +1,54 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+CONFIG_TEMPLATE = """\
+URI = "mongodb://localhost:27017"
+DB_NAME = "news_test"
+DB_COLLECTION = "articles"
+user_id = "tester"
+feed_url = ""
+source_json_path = {source!r}
+backup_json_path = {backup!r}
+database_log = {log!r}
+
+general_article_seq = 0
+current_affair_seq = 0
+upsc_key_seq = 0
+knowledge_nugget_seq = 0
+issue_glance_seq = 0
+mains_answer_weekly_seq = 0
+beyond_trending_seq = 0
+interview_seq = 0
+world_this_week_seq = 0
+"""
+
+
+@pytest.fixture
+def stub_config(tmp_path, monkeypatch):
+    """
+    Writes a throwaway config.py into tmp_path and makes it the `config`
+    module. utility modules are re-imported so they bind to it.
+    """
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+
+    config_path = tmp_path / "config.py"
+    config_path.write_text(CONFIG_TEMPLATE.format(
+        source=str(data_dir / "new.json"),
+        backup=str(data_dir / "backup.json"),
+        log=str(data_dir / "db.log")
+    ))
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+    for name in list(sys.modules):
+        if name == "config" or name.startswith("utility."):
+            monkeypatch.delitem(sys.modules, name)
+
+    import config
+    return config
@@ -0,0 +1,71 @@
+import pytest
+
+pytest.importorskip("pymongo")
+
+
+class StubCollection:
+    def __init__(self, documents):
+        self.documents = documents
+        self.deleted = []
+
+    def find(self, query, projection=None):
+        cutoff = query["$or"][1]["Added"]["$lt"]
+        return [
+            dict(doc) for doc in self.documents
+            if doc["Status"] == "Covered" or "" < doc["Added"] < cutoff
+        ]
+
+    def delete_many(self, query):
+        self.deleted.extend(query["_id"]["$in"])
+
+
+@pytest.fixture
+def archiver(stub_config):
+    from utility.db_handler import DB_Handler
+    from utility.archiver import Archiver
+
+    handler = DB_Handler()
+    handler.collection = StubCollection(
+        [{"_id": f"genArt{i:04d}", "URL": f"http://{i}", "Status": "Not Covered", "Added": "2020-01-05"} for i in range(5)]
+        + [{"_id": "genArt0099", "URL": "http://new", "Status": "Not Covered", "Added": "2999-01-01"}]
+    )
+    return Archiver(handler)
+
+
+def test_compact_moves_old_articles_to_cold_tier(archiver):
+    result = archiver.compact(max_age_days=30)
+
+    assert result == {"archived": 5, "partitions": {"2020-01": 5}}
+    assert sorted(archiver.db.collection.deleted) == [f"genArt{i:04d}" for i in range(5)]
+    assert archiver.db.is_duplicate_url("http://3")
+    assert not archiver.db.is_duplicate_url("http://new")
+
+
+def test_read_cold_pages(archiver):
+    archiver.compact(max_age_days=30)
+
+    first = list(archiver.read_cold("2020-01", offset=0, limit=3))
+    rest = list(archiver.read_cold("2020-01", offset=3, limit=3))
+
+    assert len(first) == 3 and len(rest) == 2
+    assert {doc["_id"] for doc in first + rest} == {f"genArt{i:04d}" for i in range(5)}
+
+
+def test_read_cold_rejects_bad_partition(archiver):
+    with pytest.raises(ValueError):
+        archiver.read_cold("../etc")
+
+
+def test_compact_rejects_non_positive_age(archiver):
+    for max_age_days in (0, -5):
+        with pytest.raises(ValueError):
+            archiver.compact(max_age_days=max_age_days)
+    assert archiver.db.collection.deleted == []
+
+
+def test_compact_records_archived_sequences(archiver):
+    from utility.cold_url_index import load_archived_sequences
+
+    archiver.compact(max_age_days=30)
+
+    assert load_archived_sequences() == {"genArt": 4}
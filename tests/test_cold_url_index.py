@@ -0,0 +1,53 @@
+import os
+
+
+def test_add_many_keeps_entries_from_other_instances(stub_config):
+    from utility.cold_url_index import ColdURLIndex
+
+    api_index = ColdURLIndex()
+    cli_index = ColdURLIndex()
+
+    cli_index.add_many(["http://cli-archived"])
+    api_index.add_many(["http://api-archived"])
+
+    reloaded = ColdURLIndex()
+    assert "http://cli-archived" in reloaded
+    assert "http://api-archived" in reloaded
+
+
+def test_lookup_does_not_stat(stub_config, monkeypatch):
+    from utility.cold_url_index import ColdURLIndex
+
+    index = ColdURLIndex()
+    index.add_many(["http://a"])
+
+    def fail(*args):
+        raise AssertionError("stat on lookup")
+
+    monkeypatch.setattr(os.path, "getmtime", fail)
+    monkeypatch.setattr(os.path, "exists", fail)
+    assert "http://a" in index
+    assert "http://b" not in index
+
+
+def test_refresh_picks_up_other_writers(stub_config):
+    from utility.cold_url_index import ColdURLIndex
+
+    reader = ColdURLIndex()
+    ColdURLIndex().add_many(["http://a"])
+
+    assert "http://a" not in reader
+    reader.refresh()
+    assert "http://a" in reader
+
+
+def test_archived_sequences(stub_config):
+    from utility.cold_url_index import record_archived_uids, load_archived_sequences, is_archived_uid
+
+    record_archived_uids(["genArt0003", "genArt0001", "uKey0007"])
+    record_archived_uids(["genArt0002"])
+
+    sequences = load_archived_sequences()
+    assert sequences == {"genArt": 3, "uKey": 7}
+    assert is_archived_uid("genArt0003", sequences)
+    assert not is_archived_uid("genArt0004", sequences)
@@ -0,0 +1,125 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+pymongo = pytest.importorskip("pymongo")
+
+
+class StubCollection:
+    # In-memory stand-in for the few collection calls DB_Handler makes
+
+    def __init__(self, documents, failing_urls=()):
+        self.documents = documents
+        self.failing_urls = set(failing_urls)
+        self.indexes = []
+        self.bulk_calls = []
+        self.operations = []
+
+    def create_index(self, key):
+        self.indexes.append(key)
+
+    def find(self, query, projection=None):
+        urls = set(query["URL"]["$in"])
+        return [dict(doc) for doc in self.documents if doc["URL"] in urls]
+
+    def bulk_write(self, operations, ordered=True):
+        self.bulk_calls.append(ordered)
+        write_errors = []
+        for index, operation in enumerate(operations):
+            url = operation._filter["URL"]
+            self.operations.append((url, operation._doc["$set"]["Notebook_LM"]))
+            if url in self.failing_urls:
+                write_errors.append({"index": index, "errmsg": "boom"})
+                continue
+            for doc in self.documents:
+                if doc["URL"] == url:
+                    doc.update(operation._doc["$set"])
+        if write_errors:
+            raise pymongo.errors.BulkWriteError({"writeErrors": write_errors})
+        return SimpleNamespace(matched_count=len(operations), modified_count=len(operations))
+
+
+@pytest.fixture
+def handler(stub_config):
+    from utility.db_handler import DB_Handler
+
+    handler = DB_Handler()
+    handler.collection = StubCollection([
+        {"_id": "genArt0001", "URL": "http://a", "Notebook_LM": ""},
+        {"_id": "genArt0002", "URL": "http://b", "Notebook_LM": "http://nb/b"},
+        {"_id": "genArt0003", "URL": "http://c", "Notebook_LM": ""},
+    ])
+    return handler
+
+
+def _audit_urls(handler):
+    handler.audit_log.flush()
+    with open(handler.audit_log.active_segment, "r", encoding="utf-8") as f:
+        return [json.loads(line)["url"] for line in f if "notebook_link_updated" in line]
+
+
+def test_constructor_does_not_create_index(stub_config, monkeypatch):
+    from utility import db_handler
+
+    calls = []
+    monkeypatch.setattr(db_handler.DB_Handler, "ensure_url_index", lambda self: calls.append(self))
+    db_handler.DB_Handler()
+
+    assert calls == []
+
+
+def test_bulk_update_results_per_item(handler):
+    result = handler.bulk_update_notebook_lm_links([
+        {"url": "http://a", "notebook_link": "http://nb/a"},
+        {"url": "http://b", "notebook_link": "http://nb/b"},
+        {"url": "http://missing", "notebook_link": "http://nb/x"},
+    ], user_id="tester")
+
+    assert handler.collection.indexes == ["URL"]
+    assert handler.collection.bulk_calls == [False]
+    assert [(r["matched"], r["modified"], r["not_found"], r["error"]) for r in result["results"]] == [
+        (True, True, False, None),
+        (True, False, False, None),
+        (False, False, True, None),
+    ]
+    assert _audit_urls(handler) == ["http://a"]
+
+
+def test_bulk_update_partial_failure(handler):
+    handler.collection.failing_urls = {"http://a"}
+
+    result = handler.bulk_update_notebook_lm_links([
+        {"url": "http://a", "notebook_link": "http://nb/a"},
+        {"url": "http://c", "notebook_link": "http://nb/c"},
+    ], user_id="tester")
+
+    failed, written = result["results"]
+    assert failed["error"] == "boom" and failed["modified"] is False
+    assert written["error"] is None and written["modified"] is True
+    assert result["failed_count"] == 1
+    assert _audit_urls(handler) == ["http://c"]
+
+
+def test_bulk_update_merges_duplicate_urls(handler):
+    result = handler.bulk_update_notebook_lm_links([
+        {"url": "http://a", "notebook_link": "http://nb/first"},
+        {"url": "http://a", "notebook_link": "http://nb/last"},
+    ], user_id="tester")
+
+    assert [r["modified"] for r in result["results"]] == [True, True]
+    assert handler.collection.operations == [("http://a", "http://nb/last")]
+    assert handler.collection.documents[0]["Notebook_LM"] == "http://nb/last"
+
+
+def test_bulk_update_failed_duplicate_marks_every_item(handler):
+    handler.collection.failing_urls = {"http://a"}
+
+    result = handler.bulk_update_notebook_lm_links([
+        {"url": "http://a", "notebook_link": "http://nb/first"},
+        {"url": "http://c", "notebook_link": "http://nb/c"},
+        {"url": "http://a", "notebook_link": "http://nb/last"},
+    ], user_id="tester")
+
+    assert [r["error"] for r in result["results"]] == ["boom", None, "boom"]
+    assert _audit_urls(handler) == ["http://c"]
@@ -0,0 +1,140 @@
+import os
+import sys
+import json
+import time
+import signal
+import subprocess
+
+import pytest
+
+from utility import file_writer
+from utility.file_writer import atomic_write, atomic_write_json, durable_batch
+
+
+WRITER_LOOP = """
+import sys
+sys.path.insert(0, {root!r})
+from utility.file_writer import atomic_write_json
+
+generation = 1
+while True:
+    atomic_write_json({path!r}, {{"generation": generation, "payload": ["x" * 64] * 20000}})
+    generation += 1
+"""
+
+
+def _start_writer(path):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return subprocess.Popen([sys.executable, "-c", WRITER_LOOP.format(root=root, path=str(path))])
+
+
+def _wait_for_generation(path, generation, timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        with open(path, "r", encoding="utf-8") as f:
+            if json.load(f)["generation"] >= generation:
+                return
+        time.sleep(0.01)
+    pytest.fail("writer made no progress")
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGKILL"), reason="needs SIGKILL")
+def test_kill_mid_write_keeps_last_good_state(tmp_path):
+    path = tmp_path / "backup.json"
+    atomic_write_json(path, {"generation": 0, "payload": ["x" * 64] * 20000})
+
+    for _ in range(10):
+        with open(path, "r", encoding="utf-8") as f:
+            before = json.load(f)["generation"]
+
+        writer = _start_writer(path)
+        try:
+            _wait_for_generation(path, before + 1)
+            time.sleep(0.05)
+        finally:
+            writer.send_signal(signal.SIGKILL)
+            writer.wait()
+
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        # Either the previous or a newer complete generation, never a torn file
+        assert data["generation"] > before
+        assert data["payload"] == ["x" * 64] * 20000
+
+
+def test_atomic_write_replaces_content(tmp_path):
+    path = tmp_path / "config.py"
+    atomic_write(path, "seq = 1\n")
+    atomic_write(path, "seq = 2\n")
+
+    assert path.read_text() == "seq = 2\n"
+    assert [entry.name for entry in tmp_path.iterdir()] == ["config.py"]
+
+
+def test_atomic_write_bytes(tmp_path):
+    path = tmp_path / "urls.idx"
+    atomic_write(path, b"\x00\x01")
+
+    assert path.read_bytes() == b"\x00\x01"
+
+
+def test_new_file_follows_umask(tmp_path):
+    path = tmp_path / "new.json"
+    atomic_write_json(path, {})
+
+    assert os.stat(path).st_mode & 0o777 == 0o666 & ~file_writer._current_umask()
+
+
+def test_umask_is_read_without_changing_it(monkeypatch):
+    calls = []
+    monkeypatch.setattr(os, "umask", calls.append)
+
+    if os.path.exists("/proc/self/status"):
+        assert file_writer._read_umask() == int(open("/proc/self/status").read().split("Umask:")[1].split()[0], 8)
+        assert calls == []
+
+
+def test_existing_permissions_are_kept(tmp_path):
+    path = tmp_path / "backup.json"
+    path.write_text("{}")
+    os.chmod(path, 0o640)
+
+    atomic_write_json(path, {"a": 1})
+
+    assert os.stat(path).st_mode & 0o777 == 0o640
+
+
+def test_failed_write_leaves_no_temp_file(tmp_path):
+    path = tmp_path / "backup.json"
+    atomic_write_json(path, {"a": 1})
+
+    with pytest.raises(TypeError):
+        atomic_write_json(path, {"a": object()})
+
+    assert json.loads(path.read_text()) == {"a": 1}
+    assert [entry.name for entry in tmp_path.iterdir()] == ["backup.json"]
+
+
+def test_durable_batch_defers_and_dedups_dir_fsyncs(tmp_path, monkeypatch):
+    synced = []
+    monkeypatch.setattr(file_writer, "_fsync_dir", synced.append)
+
+    other = tmp_path / "other"
+    with durable_batch():
+        atomic_write_json(tmp_path / "a.json", {})
+        atomic_write_json(tmp_path / "b.json", {})
+        with durable_batch():
+            atomic_write_json(other / "c.json", {})
+        assert synced == []
+
+    assert sorted(synced) == sorted([str(tmp_path), str(other)])
+
+
+def test_write_outside_batch_syncs_immediately(tmp_path, monkeypatch):
+    synced = []
+    monkeypatch.setattr(file_writer, "_fsync_dir", synced.append)
+
+    atomic_write_json(tmp_path / "a.json", {})
+
+    assert synced == [str(tmp_path)]
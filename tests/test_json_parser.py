@@ -0,0 +1,57 @@
+import json
+
+
+def _write_feed(config, articles):
+    with open(config.source_json_path, "w", encoding="utf-8") as f:
+        json.dump(articles, f)
+
+
+def test_stale_config_does_not_overwrite_backup(stub_config):
+    from utility.json_parser import JSON_Parser
+
+    # Backup already holds genArt0001 but the config sequence is still 0
+    with open(stub_config.backup_json_path, "w", encoding="utf-8") as f:
+        json.dump({"genArt0001": {"Type": "General Article", "Name": "Old", "URL": "http://old"}}, f)
+    _write_feed(stub_config, {"1": {"Type": "General Article", "Name": "New", "URL": "http://new"}})
+
+    assert JSON_Parser().generate_new_json() == 1
+
+    with open(stub_config.backup_json_path, "r", encoding="utf-8") as f:
+        backup = json.load(f)
+
+    assert backup["genArt0001"]["URL"] == "http://old"
+    assert backup["genArt0002"]["URL"] == "http://new"
+    assert "general_article_seq = 2" in open(stub_config.__file__).read()
+
+
+def test_archived_url_is_not_added_again(stub_config):
+    from utility.cold_url_index import ColdURLIndex
+    from utility.json_parser import JSON_Parser
+
+    # Compacted: the URL only lives in the cold tier, the old feed JSON still lists it
+    ColdURLIndex().add_many(["http://a"])
+    with open(stub_config.backup_json_path, "w", encoding="utf-8") as f:
+        json.dump({}, f)
+    _write_feed(stub_config, {"1": {"Type": "General Article", "Name": "Archived", "URL": "http://a"}})
+
+    assert JSON_Parser().generate_new_json() == 0
+
+    with open(stub_config.backup_json_path, "r", encoding="utf-8") as f:
+        assert json.load(f) == {}
+    assert "general_article_seq = 0" in open(stub_config.__file__).read()
+
+
+def test_archived_uid_is_not_reissued(stub_config):
+    from utility.cold_url_index import record_archived_uids
+    from utility.json_parser import JSON_Parser
+
+    # genArt0001 was archived, backup is empty and the config sequence lags behind
+    record_archived_uids(["genArt0001"])
+    with open(stub_config.backup_json_path, "w", encoding="utf-8") as f:
+        json.dump({}, f)
+    _write_feed(stub_config, {"1": {"Type": "General Article", "Name": "New", "URL": "http://new"}})
+
+    assert JSON_Parser().generate_new_json() == 1
+
+    with open(stub_config.backup_json_path, "r", encoding="utf-8") as f:
+        assert list(json.load(f)) == ["genArt0002"]
@@ -0,0 +1,56 @@
+import os
+
+import pytest
+
+
+def _busy():
+    return sum(i * i for i in range(200_000))
+
+
+def test_profile_run_is_stored(stub_config):
+    from utility.profiler import ProfileStore, profile_run
+
+    store = ProfileStore(2)
+    for _ in range(3):
+        with profile_run("pipeline", store=store) as profile:
+            _busy()
+
+    assert [entry["id"] for entry in store.list()] == [2, 3]
+    assert "_busy" in store.get(profile["id"])["pstats"]
+    assert store.get(1) is None
+
+
+def test_cli_profile_written_when_run_fails(stub_config, tmp_path, monkeypatch):
+    from utility.profiler import profile_from_env
+
+    output_dir = tmp_path / "profiles"
+    monkeypatch.setenv("NEWS_SERVICE_PROFILE", "1")
+    monkeypatch.setenv("NEWS_SERVICE_PROFILE_DIR", str(output_dir))
+
+    with pytest.raises(RuntimeError):
+        with profile_from_env("feed_parser"):
+            _busy()
+            raise RuntimeError("feed down")
+
+    written = sorted(path.name for path in output_dir.iterdir())
+    assert len(written) == 2
+    assert written[0].startswith("feed_parser-") and written[0].endswith(f"-{os.getpid()}.collapsed.txt")
+    assert "_busy" in (output_dir / written[1]).read_text()
+
+
+def test_cli_profiles_do_not_overwrite_each_other(stub_config, tmp_path, monkeypatch):
+    from utility.profiler import profile_from_env
+
+    output_dir = tmp_path / "profiles"
+    monkeypatch.setenv("NEWS_SERVICE_PROFILE", "1")
+    monkeypatch.setenv("NEWS_SERVICE_PROFILE_DIR", str(output_dir))
+
+    with profile_from_env("json_parser"):
+        _busy()
+
+    # A new process starts its ids at 1 again
+    monkeypatch.setattr(os, "getpid", lambda: 999999)
+    with profile_from_env("json_parser"):
+        _busy()
+
+    assert len(list(output_dir.iterdir())) == 4
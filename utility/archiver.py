@@ -0,0 +1,159 @@
+import os
+import io
+import json
+import gzip
+import re
+from itertools import islice
+from datetime import date, datetime, timedelta
+
+import config as CONFIG
+from utility.db_handler import DB_Handler
+from utility.file_writer import atomic_write, atomic_write_json, durable_batch
+from utility.cold_url_index import record_archived_uids
+from utility.commit_maker import CommitMaker
+from utility.profiler import profile_from_env
+
+
+class Archiver:
+    """
+    Moves old or covered articles out of MongoDB and the backup JSON into
+    gzip JSONL cold files partitioned by month: <archive_path>/YYYY-MM/*.jsonl.gz
+    """
+
+    def __init__(self, db_handler: DB_Handler = None):
+        self.db = db_handler or DB_Handler()
+        self.backup_json_path = CONFIG.backup_json_path
+
+        self.archive_path = self.db.archive_path
+        self.max_age_days = getattr(CONFIG, "archive_max_age_days", 180)
+        self.archive_status = getattr(CONFIG, "archive_status", "Covered")
+        self.cold_urls = self.db.cold_urls
+
+    def _find_candidates(self, max_age_days: int):
+        cutoff = (date.today() - timedelta(days=max_age_days)).isoformat()
+
+        # Articles without an "Added" date can only be archived by status
+        query = {
+            "$or": [
+                {"Status": self.archive_status},
+                {"Added": {"$gt": "", "$lt": cutoff}}
+            ]
+        }
+        return list(self.db.collection.find(query))
+
+    def _partition(self, document: dict, archived_on: str) -> str:
+        # Month the article was added, or the compaction month if unknown
+        added = document.get("Added") or archived_on
+        return added[:7]
+
+    def _write_partition(self, partition: str, documents: list[dict], run_stamp: str) -> str:
+        path = os.path.join(self.archive_path, partition, f"articles-{run_stamp}.jsonl.gz")
+
+        buffer = io.BytesIO()
+        with gzip.GzipFile(fileobj=buffer, mode="wb", mtime=0) as gz:
+            for document in documents:
+                gz.write((json.dumps(document, ensure_ascii=False) + "\n").encode("utf-8"))
+
+        atomic_write(path, buffer.getvalue())
+        return path
+
+    def compact(self, max_age_days: int = None, user_id: str = None):
+        """
+        Cold files and the URL index are written first, hot copies are removed last.
+        A crash in between leaves an article in both tiers, never in neither.
+        """
+        if max_age_days is None:
+            max_age_days = self.max_age_days
+        if max_age_days < 1:
+            raise ValueError("max_age_days must be at least 1.")
+
+        candidates = self._find_candidates(max_age_days)
+        if not candidates:
+            print("Nothing to archive.")
+            return {"archived": 0, "partitions": {}}
+
+        if os.path.exists(self.backup_json_path):
+            backup = self.db.load_json()
+        else:
+            backup = {}
+
+        archived_on = date.today().isoformat()
+        run_stamp = datetime.now().strftime("%Y%m%dT%H%M%S")
+
+        partitions = {}
+        for document in candidates:
+            # Keep whatever the backup JSON knows, the database copy wins on conflicts
+            merged = {**backup.get(document["_id"], {}), **document, "Archived": archived_on}
+            partitions.setdefault(self._partition(merged, archived_on), []).append(merged)
+
+        uids = [document["_id"] for document in candidates]
+
+        with durable_batch():
+            for partition, documents in partitions.items():
+                self._write_partition(partition, documents, run_stamp)
+
+            self.cold_urls.add_many(document["URL"] for document in candidates if document.get("URL"))
+            record_archived_uids(uids)
+
+            for uid in uids:
+                backup.pop(uid, None)
+            if os.path.exists(self.backup_json_path):
+                atomic_write_json(self.backup_json_path, backup)
+
+        self.db.collection.delete_many({"_id": {"$in": uids}})
+
+        for uid in uids:
+            self.db.audit_log.record("archived", uid=uid, user_id=user_id)
+
+        print(f"{len(uids)} articles moved to the cold archive.")
+        return {
+            "archived": len(uids),
+            "partitions": {partition: len(documents) for partition, documents in partitions.items()}
+        }
+
+    def list_partitions(self) -> list[str]:
+        if not os.path.isdir(self.archive_path):
+            return []
+        return sorted(
+            entry for entry in os.listdir(self.archive_path)
+            if re.fullmatch(r"\d{4}-\d{2}", entry) and os.path.isdir(os.path.join(self.archive_path, entry))
+        )
+
+    def read_cold(self, partition: str = None, offset: int = 0, limit: int = None):
+        """
+        Yields archived articles, optionally from a single YYYY-MM partition.
+        Files are decompressed lazily, only as far as offset + limit reaches.
+        """
+        if partition and not re.fullmatch(r"\d{4}-\d{2}", partition):
+            raise ValueError(f"Invalid partition {partition}, expected YYYY-MM.")
+
+        articles = self._iter_cold(partition)
+        return islice(articles, offset, None if limit is None else offset + limit)
+
+    def _iter_cold(self, partition: str = None):
+        partitions = [partition] if partition else self.list_partitions()
+
+        seen = set()
+        for name in partitions:
+            directory = os.path.join(self.archive_path, name)
+            if not os.path.isdir(directory):
+                continue
+
+            # Newest file first, so a re-archived article yields its latest copy
+            for file_name in sorted(os.listdir(directory), reverse=True):
+                if not file_name.endswith(".jsonl.gz"):
+                    continue
+                with gzip.open(os.path.join(directory, file_name), "rt", encoding="utf-8") as f:
+                    for line in f:
+                        document = json.loads(line)
+                        if document["_id"] in seen:
+                            continue
+                        seen.add(document["_id"])
+                        yield document
+
+
+if __name__ == "__main__":
+    with profile_from_env("archiver"):
+        archiver = Archiver()
+        archiver.compact(user_id=CONFIG.user_id)
+        CommitMaker().commit_if_needed()
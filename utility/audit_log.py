@@ -0,0 +1,146 @@
+import os
+import glob
+import json
+import time
+import queue
+import atexit
+import logging
+import threading
+from datetime import datetime, timezone
+from logging.handlers import BaseRotatingHandler, QueueHandler, QueueListener
+
+import config as CONFIG
+
+
+class JSONLineFormatter(logging.Formatter):
+    # One JSON object per line: uid, user_id, action, timestamp
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="seconds"),
+            "action": getattr(record, "action", None),
+            "uid": getattr(record, "uid", None),
+            "user_id": getattr(record, "user_id", None),
+        }
+        entry.update(getattr(record, "fields", {}))
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class SegmentedFileHandler(BaseRotatingHandler):
+    """
+    Rotates the active log on size or age. Closed segments get a timestamped
+    name and are never rewritten, so git only ever sees the active file change.
+    """
+
+    def __init__(self, filename: str, max_bytes: int, max_age: int, encoding: str = "utf-8"):
+        super().__init__(filename, "a", encoding=encoding, delay=True)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+
+        # Same as TimedRotatingFileHandler: an existing file's age counts from its mtime
+        if os.path.exists(self.baseFilename):
+            started = os.path.getmtime(self.baseFilename)
+        else:
+            started = time.time()
+        self.rollover_at = started + self.max_age
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if not os.path.exists(self.baseFilename):
+            return False
+
+        if self.max_age > 0 and time.time() >= self.rollover_at:
+            return True
+
+        if self.max_bytes > 0:
+            if self.stream is None:
+                self.stream = self._open()
+            # Checked before the write, so a segment may overshoot by one line
+            if self.stream.tell() >= self.max_bytes:
+                return True
+
+        return False
+
+    def doRollover(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+
+        suffix = datetime.now().strftime("%Y%m%d-%H%M%S")
+        segment = f"{self.baseFilename}.{suffix}"
+        counter = 1
+        while os.path.exists(segment):
+            segment = f"{self.baseFilename}.{suffix}-{counter}"
+            counter += 1
+
+        os.replace(self.baseFilename, segment)
+        self.rollover_at = time.time() + self.max_age
+
+
+class AuditLog:
+    """
+    Database audit trail. Records are queued and written by a background
+    listener thread, so callers never wait on file I/O.
+    """
+
+    def __init__(self, log_path: str):
+        self.active_segment = log_path
+        self.closed = False
+
+        self.queue = queue.SimpleQueue()
+        self.file_handler = SegmentedFileHandler(
+            log_path,
+            max_bytes=getattr(CONFIG, "database_log_max_bytes", 5 * 1024 * 1024),
+            max_age=getattr(CONFIG, "database_log_max_age", 7 * 24 * 60 * 60)
+        )
+        self.file_handler.setFormatter(JSONLineFormatter())
+        self.listener = QueueListener(self.queue, self.file_handler)
+
+        # Separate logger, so it never mixes with the service's root logging config
+        self.logger = logging.getLogger("news_service.audit")
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        self.logger.handlers = [QueueHandler(self.queue)]
+
+        self.listener.start()
+
+    def closed_segments(self) -> list[str]:
+        # Rotated segments are immutable, staging them again is a no-op for git
+        return sorted(
+            path for path in glob.glob(f"{glob.escape(self.active_segment)}.*")
+            if not path.endswith(".tmp")
+        )
+
+    def record(self, action: str, uid: str = None, user_id: str = None, **fields):
+        self.logger.info(
+            action,
+            extra={"action": action, "uid": uid, "user_id": user_id, "fields": fields}
+        )
+
+    def flush(self):
+        # Drain everything queued so far onto disk
+        self.listener.stop()
+        self.file_handler.flush()
+        self.listener.start()
+
+    def close(self):
+        # Safe to call twice, atexit closes it again
+        if self.closed:
+            return
+        self.closed = True
+        self.listener.stop()
+        self.file_handler.close()
+
+
+_audit_log = None
+_audit_log_lock = threading.Lock()
+
+
+def get_audit_log() -> AuditLog:
+    # Shared instance, every DB_Handler writes to the same active segment
+    global _audit_log
+
+    with _audit_log_lock:
+        if _audit_log is None:
+            _audit_log = AuditLog(CONFIG.database_log)
+            atexit.register(_audit_log.close)
+        return _audit_log
@@ -0,0 +1,145 @@
+import os
+import re
+import json
+import hashlib
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    # Not on Windows, the API's pipeline lock is the only guard there
+    fcntl = None
+
+import config as CONFIG
+from utility.file_writer import atomic_write, atomic_write_json
+
+
+def archive_dir() -> str:
+    # Cold tier lives next to the backup JSON unless configured otherwise
+    return getattr(
+        CONFIG, "archive_path",
+        os.path.join(os.path.dirname(CONFIG.backup_json_path), "archive")
+    )
+
+
+@contextmanager
+def archive_lock(directory: str = None):
+    """
+    Cross-process lock for read-merge-write updates of the archive metadata,
+    so the API and the archiver CLI can't drop each other's entries.
+    """
+    directory = directory or archive_dir()
+    os.makedirs(directory, exist_ok=True)
+
+    # CommitMaker stages the whole archive directory, keep the lock and temp files out
+    ignore_path = os.path.join(directory, ".gitignore")
+    if not os.path.exists(ignore_path):
+        atomic_write(ignore_path, ".lock\n.*.tmp\n")
+
+    with open(os.path.join(directory, ".lock"), "a") as f:
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _sequences_path() -> str:
+    return os.path.join(archive_dir(), "sequences.json")
+
+
+def load_archived_sequences() -> dict:
+    # Highest archived UID number per prefix, e.g. {"genArt": 42}
+    path = _sequences_path()
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def record_archived_uids(uids):
+    # Keeps the sequences of archived UIDs, so they are never issued again
+    with archive_lock():
+        sequences = load_archived_sequences()
+        for uid in uids:
+            match = re.fullmatch(r"([A-Za-z]+)(\d+)", uid)
+            if match:
+                prefix, number = match.group(1), int(match.group(2))
+                sequences[prefix] = max(sequences.get(prefix, 0), number)
+        atomic_write_json(_sequences_path(), sequences)
+
+
+def is_archived_uid(uid: str, sequences: dict) -> bool:
+    match = re.fullmatch(r"([A-Za-z]+)(\d+)", uid)
+    return bool(match) and int(match.group(2)) <= sequences.get(match.group(1), 0)
+
+
+class ColdURLIndex:
+    """
+    Compact on-disk set of archived URLs: sorted 8 byte blake2b digests.
+    Membership is a binary search over the raw bytes, no per-URL objects.
+    """
+
+    RECORD_SIZE = 8
+
+    def __init__(self, index_path: str = None):
+        index_path = index_path or os.path.join(archive_dir(), "urls.idx")
+
+        self.index_path = index_path
+        self.data = b""
+        self.loaded_mtime = None
+        self.load()
+
+    @classmethod
+    def digest(cls, url: str) -> bytes:
+        return hashlib.blake2b(url.encode("utf-8"), digest_size=cls.RECORD_SIZE).digest()
+
+    def load(self):
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "rb") as f:
+                self.data = f.read()
+            self.loaded_mtime = os.path.getmtime(self.index_path)
+        else:
+            self.data = b""
+            self.loaded_mtime = None
+
+    def refresh(self):
+        # Another process (or handler) may have compacted since we loaded
+        current_mtime = os.path.getmtime(self.index_path) if os.path.exists(self.index_path) else None
+        if current_mtime != self.loaded_mtime:
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self.data) // self.RECORD_SIZE
+
+    def _record(self, position: int) -> bytes:
+        start = position * self.RECORD_SIZE
+        return self.data[start:start + self.RECORD_SIZE]
+
+    def __contains__(self, url: str) -> bool:
+        # No refresh here, callers refresh once per run instead of a stat per lookup
+        target = self.digest(url)
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            if self._record(middle) < target:
+                low = middle + 1
+            else:
+                high = middle
+        return low < len(self) and self._record(low) == target
+
+    def add_many(self, urls):
+        # Merge new digests into the latest index on disk and rewrite it atomically
+        with archive_lock(os.path.dirname(self.index_path)):
+            self.refresh()
+            self._merge(urls)
+
+    def _merge(self, urls):
+        records = {self._record(i) for i in range(len(self))}
+        records.update(self.digest(url) for url in urls)
+
+        self.data = b"".join(sorted(records))
+        atomic_write(self.index_path, self.data)
+        self.loaded_mtime = os.path.getmtime(self.index_path)
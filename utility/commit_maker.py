@@ -6,6 +6,9 @@ import time
 from typing import Set, Dict
 
 import config as CONFIG
+from utility.audit_log import get_audit_log
+from utility.cold_url_index import archive_dir
+from utility.profiler import profile_from_env
 
 class FileTracker:
     # Track file state using hash comparision
@@ -81,6 +84,7 @@ class CommitMaker:
         self.repo_path = CONFIG.backup_json_path
         self.json_detector = JSONChangeDetector(CONFIG.backup_json_path)
         self.git = GitHandler(self.repo_path)
+        self.audit_log = get_audit_log()
     
     def commit_if_needed(self):
         if not self._has_git_changes():
@@ -89,10 +93,20 @@ class CommitMaker:
         new_ids = self.json_detector.detect_new_ids()
         commit_msg = self._build_commit_message(new_ids)
 
+        # Make sure queued audit records are on disk before staging.
+        # Closed segments are staged too, so the tail written before a rotation reaches git.
+        self.audit_log.flush()
         self.git.stage_files([
             CONFIG.backup_json_path,
-            CONFIG.database_log
+            self.audit_log.active_segment,
+            *self.audit_log.closed_segments()
         ])
+
+        # Archived articles only exist in the cold files once compacted, they need the backup too.
+        # Staged on their own: git rejects the whole add if a path is missing or outside the repo.
+        if os.path.isdir(archive_dir()):
+            self.git.stage_files([archive_dir()])
+
         self.git.commit(commit_msg)
         return commit_msg
     
@@ -116,5 +130,6 @@ class CommitMaker:
 
 
 if __name__ == "__main__":
-    committer = CommitMaker()
-    committer.run()
\ No newline at end of file
+    with profile_from_env("commit_maker"):
+        committer = CommitMaker()
+        committer.commit_if_needed()
\ No newline at end of file
@@ -1,9 +1,13 @@
 import json
 import os
 import logging
-from pymongo import MongoClient, errors
+from datetime import date
+from pymongo import MongoClient, UpdateOne, errors
 
 import config as CONFIG
+from utility.audit_log import get_audit_log
+from utility.cold_url_index import ColdURLIndex, archive_dir
+from utility.profiler import profile_from_env
 
 
 class DB_Handler:
@@ -13,21 +17,25 @@ class DB_Handler:
         self.database = self.client[CONFIG.DB_NAME]
         self.collection = self.database[CONFIG.DB_COLLECTION]
 
+        # URL index is built on first use, so constructing a handler never waits on the server
+        self.url_index_created = False
+
         self.backup_json_path = CONFIG.backup_json_path
         self.log_file_path = CONFIG.database_log
 
-        logging.basicConfig(
-            filename = self.log_file_path,
-            level=logging.INFO,
-            format='%(asctime)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
+        # Non-blocking audit trail, shared by every handler instance
+        self.audit_log = get_audit_log()
+        self.logger = logging.getLogger(__name__)
 
         # Track last modified time of json
         self.last_modified = None
 
         # Reverse index for URL
         self.url_index = {}
+
+        # URLs of archived articles, so they are not ingested again
+        self.archive_path = archive_dir()
+        self.cold_urls = ColdURLIndex(os.path.join(self.archive_path, "urls.idx"))
     
 
     def built_url_index(self):
@@ -47,9 +55,10 @@ class DB_Handler:
     
 
     def is_duplicate_url(self, url: str) -> bool:
-        # O(1) URL duplicate detection using the in-memory dictionary
+        # O(1) URL duplicate detection using the in-memory dictionary,
+        # then the on-disk set of archived URLs
 
-        return url in self.url_index
+        return url in self.url_index or url in self.cold_urls
     
 
     def load_json(self):
@@ -79,6 +88,9 @@ class DB_Handler:
             return 0
         
         
+        # Pick up URLs archived since the last run
+        self.cold_urls.refresh()
+
         if not self.check_for_changes():
             print("Database is up to date. \n")
             return 0
@@ -98,7 +110,7 @@ class DB_Handler:
 
         if not new_ids:
             message = "Checked for updates. None found. Database is up to date."
-            logging.info(message)
+            self.audit_log.record("sync_checked", user_id=user_id)
             print(message)
             return 0
 
@@ -109,7 +121,7 @@ class DB_Handler:
             # skip if url is duplicate
             url = entry.get("URL","")
             if self.is_duplicate_url(url):
-                logging.info(f"Duplicate URL skiped for {uid}: {url}")
+                self.audit_log.record("duplicate_skipped", uid=uid, user_id=user_id, url=url)
                 continue
 
 
@@ -120,7 +132,8 @@ class DB_Handler:
                 "Type": entry.get("Type",""),
                 "URL": url,
                 "Status": "Not Covered",
-                "Notebook_LM": ""
+                "Notebook_LM": "",
+                "Added": entry.get("Added") or date.today().isoformat()
             }    
                
 
@@ -129,8 +142,7 @@ class DB_Handler:
                 
                 self.collection.insert_one(document)
                 new_entries_count +=1
-                log_message = f"{uid} added by {user_id}."
-                logging.info(log_message)
+                self.audit_log.record("added", uid=uid, user_id=user_id)
 
                 # update url-index
                 if url:
@@ -148,11 +160,20 @@ class DB_Handler:
             return new_entries_count
 
     
+    def ensure_url_index(self):
+        # URL lookups (Notebook LM updates) use an index instead of a collection scan
+        if not self.url_index_created:
+            self.collection.create_index("URL")
+            self.url_index_created = True
+
+
     def update_notebook_lm_link(self, url:str, NotebookLink: str, user_id: str):
         # Adds Notebook LM into the database
 
         if not url or not NotebookLink:
             raise ValueError("URL and Notebook Link are required.")
+
+        self.ensure_url_index()
         
         result = self.collection.update_one(
             {"URL": url},
@@ -164,21 +185,101 @@ class DB_Handler:
         )
 
         if result.matched_count == 0:
-            logging.warning(f"No article found for URL: {url}")
+            self.logger.warning(f"No article found for URL: {url}")
             print("No matching article found. Notebook LM link not updated.")
             return
 
         if result.modified_count == 1:
-            logging.info(f"Notebook LM updated by {user_id} for URL: {url}")
+            self.audit_log.record("notebook_link_updated", user_id=user_id, url=url)
             print("Notebook LM link updated successfully.")
         else:
             print("Notebook LM link already up to date.")
 
 
+    def bulk_update_notebook_lm_links(self, updates: list[dict], user_id: str):
+        """
+        Applies many {url, notebook_link} pairs with a single unordered bulk_write.
+        Returns a result per item: matched, modified, not_found and error.
+        """
+
+        if not updates:
+            return {"matched_count": 0, "modified_count": 0, "not_found_count": 0, "failed_count": 0, "results": []}
+
+        for item in updates:
+            if not item.get("url") or not item.get("notebook_link"):
+                raise ValueError("URL and Notebook Link are required.")
+
+        self.ensure_url_index()
+
+        # Current links of every requested URL, one indexed query
+        urls = list({item["url"] for item in updates})
+        current_links = {
+            doc["URL"]: doc.get("Notebook_LM", "")
+            for doc in self.collection.find({"URL": {"$in": urls}}, {"URL": 1, "Notebook_LM": 1})
+        }
+
+        stored_links = dict(current_links)
+        url_results = {}
+        results = []
+        for item in updates:
+            url = item["url"]
+            link = item["notebook_link"]
+
+            if url not in current_links:
+                results.append({"url": url, "matched": False, "modified": False, "not_found": True, "error": None})
+                continue
+
+            modified = current_links[url] != link
+            # A later item for the same URL sees the earlier one applied
+            current_links[url] = link
+            entry = {"url": url, "matched": True, "modified": modified, "not_found": False, "error": None}
+            results.append(entry)
+            url_results.setdefault(url, []).append(entry)
+
+        # One operation per URL with its last link: unordered writes have no
+        # defined order, so duplicates can't be left for the server to settle
+        operation_urls = [url for url, link in current_links.items() if link != stored_links[url]]
+        operations = [
+            UpdateOne({"URL": url}, {"$set": {"Notebook_LM": current_links[url]}})
+            for url in operation_urls
+        ]
+
+        if operations:
+            try:
+                result = self.collection.bulk_write(operations, ordered=False)
+                self.logger.info(
+                    "Notebook LM bulk update: %s matched, %s modified",
+                    result.matched_count, result.modified_count
+                )
+            except errors.BulkWriteError as e:
+                # Unordered: every operation not listed in writeErrors was still applied
+                for write_error in e.details.get("writeErrors", []):
+                    for entry in url_results[operation_urls[write_error["index"]]]:
+                        entry["modified"] = False
+                        entry["error"] = write_error.get("errmsg", "write failed")
+                self.logger.warning(
+                    "Notebook LM bulk update: %s of %s writes failed",
+                    len(e.details.get("writeErrors", [])), len(operations)
+                )
+
+        for entry in results:
+            if entry["modified"]:
+                self.audit_log.record("notebook_link_updated", user_id=user_id, url=entry["url"])
+
+        return {
+            "matched_count": sum(entry["matched"] for entry in results),
+            "modified_count": sum(entry["modified"] for entry in results),
+            "not_found_count": sum(entry["not_found"] for entry in results),
+            "failed_count": sum(entry["error"] is not None for entry in results),
+            "results": results
+        }
+
+
 
 
 
 if __name__ == "__main__":
-    db_handler = DB_Handler()
-    db_handler.sync_db(user_id=CONFIG.user_id)
+    with profile_from_env("db_handler"):
+        db_handler = DB_Handler()
+        db_handler.sync_db(user_id=CONFIG.user_id)
 
@@ -7,6 +7,8 @@ import re
 
 import config as CONFIG
 from utility.db_handler import DB_Handler
+from utility.file_writer import atomic_write_json
+from utility.profiler import profile_from_env
 
 
 class FeedTracker:
@@ -72,6 +74,9 @@ class FeedTracker:
 
     def check_feed(self):
 
+        # Pick up URLs archived since the last run
+        self.db.cold_urls.refresh()
+
         feed = feedparser.parse(self.feed_url)
         new_articles = {}
 
@@ -106,13 +111,13 @@ class FeedTracker:
         
         os.makedirs(os.path.dirname(self.new_json),exist_ok=True)
 
-        with open(self.new_json, "w", encoding="utf-8") as f:
-            json.dump(new_articles, f, indent=4, ensure_ascii=False)
+        atomic_write_json(self.new_json, new_articles)
 
         print (f"Saved {len(new_articles)} new unique articles.")
         return len(new_articles)
         
 
 if __name__ == "__main__":
-    tracker = FeedTracker()
-    tracker.check_feed()
\ No newline at end of file
+    with profile_from_env("feed_parser"):
+        tracker = FeedTracker()
+        tracker.check_feed()
\ No newline at end of file
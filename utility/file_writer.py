@@ -0,0 +1,123 @@
+import os
+import json
+import stat
+import tempfile
+import threading
+from contextlib import contextmanager
+
+
+# Directories waiting for their fsync while a durable batch is open
+_batch_state = threading.local()
+
+# mkstemp always creates 0600, new files should follow the umask like open() does
+_umask = None
+_umask_lock = threading.Lock()
+
+
+def _read_umask() -> int:
+    # Linux exposes it without changing it
+    try:
+        with open("/proc/self/status", "r", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("Umask:"):
+                    return int(line.split()[1], 8)
+    except (OSError, ValueError):
+        pass
+
+    # Elsewhere the only way is set-and-restore. A file another thread creates
+    # in that instant uses the temporary 022 mask, which is why this runs once, lazily.
+    current = os.umask(0o022)
+    os.umask(current)
+    return current
+
+
+def _current_umask() -> int:
+    global _umask
+
+    with _umask_lock:
+        if _umask is None:
+            _umask = _read_umask()
+        return _umask
+
+
+def _fsync_dir(directory: str):
+    # Persist the rename itself. Not every platform allows opening a directory.
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write(path: str, content, encoding: str = "utf-8"):
+    """
+    Replaces `path` with `content` (str or bytes) using temp file -> fsync -> rename.
+    Readers and crashes only ever see the old file or the complete new one.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(
+        dir=directory,
+        prefix=f".{os.path.basename(path)}.",
+        suffix=".tmp"
+    )
+
+    try:
+        if isinstance(content, bytes):
+            f = os.fdopen(fd, "wb")
+        else:
+            f = os.fdopen(fd, "w", encoding=encoding)
+
+        with f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+
+        # Keep the permissions of the file being replaced
+        if os.path.exists(path):
+            os.chmod(tmp_path, stat.S_IMODE(os.stat(path).st_mode))
+        else:
+            os.chmod(tmp_path, 0o666 & ~_current_umask())
+
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+    pending_dirs = getattr(_batch_state, "pending_dirs", None)
+    if pending_dirs is None:
+        _fsync_dir(directory)
+    else:
+        pending_dirs.add(directory)
+
+
+def atomic_write_json(path: str, data):
+    atomic_write(path, json.dumps(data, indent=4, ensure_ascii=False))
+
+
+@contextmanager
+def durable_batch():
+    """
+    Groups the directory fsyncs of every atomic_write inside the block,
+    so a pipeline run pays one barrier per directory instead of one per file.
+    """
+    if getattr(_batch_state, "pending_dirs", None) is not None:
+        # Nested batch, the outer one flushes
+        yield
+        return
+
+    _batch_state.pending_dirs = set()
+    try:
+        yield
+    finally:
+        pending_dirs = _batch_state.pending_dirs
+        _batch_state.pending_dirs = None
+        for directory in pending_dirs:
+            _fsync_dir(directory)
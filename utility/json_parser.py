@@ -1,8 +1,12 @@
 import json
 import re
 import os
+from datetime import date
 
 import config as CONFIG
+from utility.file_writer import atomic_write, atomic_write_json
+from utility.cold_url_index import ColdURLIndex, load_archived_sequences, is_archived_uid
+from utility.profiler import profile_from_env
 
 class JSON_Parser : 
 
@@ -11,6 +15,9 @@ class JSON_Parser :
         self.source_path = CONFIG.source_json_path
         self.destination_path = CONFIG.backup_json_path
 
+        # Archived URLs are gone from the backup JSON but must stay deduplicated
+        self.cold_urls = ColdURLIndex()
+
         self.TYPE_MAP = {
             "General Article" : "genArt",
             "Current Affairs Pointers"  : "cuAff",
@@ -94,8 +101,7 @@ class JSON_Parser :
             else:
                 new_lines.append(line)
 
-        with open(path, "w", encoding="utf-8") as f:
-            f.writelines(new_lines)
+        atomic_write(path, "".join(new_lines))
 
 
     def mains_answer_processor(self, raw_title):
@@ -134,6 +140,10 @@ class JSON_Parser :
 
         os.makedirs(os.path.dirname(self.destination_path), exist_ok=True)
 
+        # Archive state as of this run
+        self.cold_urls.refresh()
+        archived_sequences = load_archived_sequences()
+
         with open(self.source_path, "r", encoding="utf-8") as f:
             data = json.load(f)
 
@@ -170,19 +180,23 @@ class JSON_Parser :
                     title = self.clean_title(article["Name"], article_type)
                 link = article["URL"]
 
-                # Skipping enty if url already present.
-                if link in existing_url:
+                # Skipping enty if url already present, here or in the archive.
+                if link in existing_url or link in self.cold_urls:
                         # messages look ugly
                     #print(f"Skipping duplicate: {title} at {_}.\n\n")
                     continue
 
                     # Checking UID after duplicates are checked
                 unique_id = self.UID_Maker(article_type)
+                while unique_id in new_data or is_archived_uid(unique_id, archived_sequences):
+                    # Config behind the backup or the archive, never reuse an existing UID
+                    unique_id = self.UID_Maker(article_type)
 
                 new_data[unique_id] = {
                     "Type": article_type,
                     "Name": title,
-                    "URL" : link
+                    "URL" : link,
+                    "Added": date.today().isoformat()
                 }
 
                 existing_url.add(link)  # maintain the index
@@ -195,13 +209,15 @@ class JSON_Parser :
             print(f"Added {article_counter} articles in the JSON. \n")
 
 
-            with open(self.destination_path,"w", encoding="utf-8") as f:
-                json.dump(new_data, f, indent=4, ensure_ascii=False)
-                
+            # Sequences first: a crash in between only leaves a gap in the UIDs,
+            # never a stale sequence that would overwrite backup entries
             self.save_config()
+
+            atomic_write_json(self.destination_path, new_data)
         
         return article_counter
                 
 if __name__=="__main__":
-    jsonParser = JSON_Parser()
-    jsonParser.generate_new_json()
+    with profile_from_env("json_parser"):
+        jsonParser = JSON_Parser()
+        jsonParser.generate_new_json()
@@ -0,0 +1,155 @@
+import gc
+import io
+import os
+import sys
+import time
+import pstats
+import cProfile
+import itertools
+import threading
+from collections import Counter, deque
+from contextlib import contextmanager, nullcontext
+
+import config as CONFIG
+
+
+class StackSampler:
+    # Samples one thread's Python stack at a fixed interval, for flamegraphs
+
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            # A GC pass starting inside sys._current_frames can deadlock the
+            # interpreter (CPython gh-106883), keep it off for the snapshot
+            gc_enabled = gc.isenabled()
+            gc.disable()
+            try:
+                frame = sys._current_frames().get(self.thread_id)
+            finally:
+                if gc_enabled:
+                    gc.enable()
+            if frame is None:
+                continue
+
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+
+            self.samples[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def collapsed(self) -> str:
+        # Brendan Gregg's collapsed format: "frame;frame;frame count"
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+class ProfileStore:
+    """
+    Keeps the last N profiles in memory. Each one holds the cProfile
+    report (pstats text) and the sampled stacks (collapsed text).
+    """
+
+    def __init__(self, size: int):
+        self.profiles = deque(maxlen=size)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def next_id(self) -> int:
+        return next(self._ids)
+
+    def add(self, profile: dict):
+        with self._lock:
+            self.profiles.append(profile)
+
+    def get(self, profile_id: int):
+        with self._lock:
+            for profile in self.profiles:
+                if profile["id"] == profile_id:
+                    return profile
+        return None
+
+    def list(self) -> list[dict]:
+        with self._lock:
+            return [
+                {key: profile[key] for key in ("id", "label", "started", "duration")}
+                for profile in self.profiles
+            ]
+
+
+profile_store = ProfileStore(getattr(CONFIG, "profile_ring_size", 10))
+
+
+@contextmanager
+def profile_run(label: str, store: ProfileStore = profile_store):
+    """
+    Profiles the block with cProfile and a stack sampler and saves the result
+    to `store`. Yields the profile dict, its "id" is known up front.
+    """
+    profile = {"id": store.next_id(), "label": label, "started": time.time()}
+
+    profiler = cProfile.Profile()
+    sampler = StackSampler(threading.get_ident())
+
+    sampler.start()
+    profiler.enable()
+    try:
+        yield profile
+    finally:
+        profiler.disable()
+        sampler.stop()
+
+        report = io.StringIO()
+        pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats()
+
+        profile["duration"] = time.time() - profile["started"]
+        profile["pstats"] = report.getvalue()
+        profile["collapsed"] = sampler.collapsed()
+        store.add(profile)
+
+
+@contextmanager
+def _profile_to_files(label: str):
+    profile = {}
+    try:
+        with profile_run(label) as profile:
+            yield profile
+    finally:
+        # Also on failure, a crashing run is the one worth looking at
+        if "pstats" in profile:
+            _write_profile_files(label, profile)
+
+
+def _write_profile_files(label: str, profile: dict):
+    output_dir = os.environ.get("NEWS_SERVICE_PROFILE_DIR", os.getcwd())
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Ids restart in every process, timestamp and pid keep CLI runs apart
+    stamp = time.strftime("%Y%m%dT%H%M%S", time.localtime(profile["started"]))
+    name = f"{label}-{stamp}-{os.getpid()}"
+
+    for kind, extension in (("pstats", "pstats.txt"), ("collapsed", "collapsed.txt")):
+        path = os.path.join(output_dir, f"{name}.{extension}")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(profile[kind])
+        print(f"Profile written to {path}")
+
+
+def profile_from_env(label: str):
+    # CLI entry points: NEWS_SERVICE_PROFILE=1 profiles the run and writes the reports to disk
+    if os.environ.get("NEWS_SERVICE_PROFILE", "").lower() in ("1", "true", "yes"):
+        return _profile_to_files(label)
+    return nullcontext()